@@ -0,0 +1,27 @@
+"""
+Shared JSON file cache for the config package
+Parsed files are memoized by (path, mtime) so repeated loads skip disk I/O.
+frontend/config.json is parsed once at import and shared as FRONTEND_CONFIG.
+"""
+
+import functools
+from pathlib import Path
+
+import orjson
+
+
+@functools.lru_cache(maxsize=4)
+def _load_json_cached(path_str: str, mtime: float) -> dict:
+    """Parse a JSON file. Cached per (path, mtime) - callers must not mutate the result."""
+    return orjson.loads(Path(path_str).read_bytes())
+
+
+def load_json(path: Path) -> dict:
+    """Load a JSON file, reusing the parsed dict while the file is unchanged."""
+    return _load_json_cached(str(path), path.stat().st_mtime)
+
+
+# frontend/config.json, parsed once and shared by environment.py and prompts.py
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+FRONTEND_CONFIG_PATH = REPO_ROOT / 'frontend' / 'config.json'
+FRONTEND_CONFIG: dict = load_json(FRONTEND_CONFIG_PATH) if FRONTEND_CONFIG_PATH.exists() else {}
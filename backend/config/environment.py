@@ -4,11 +4,11 @@ Uses API Key authentication (not Vertex AI)
 """
 
 import os
-import json
 import logging
-from pathlib import Path
 from dotenv import load_dotenv
 
+from config._json_cache import FRONTEND_CONFIG
+
 logger = logging.getLogger(__name__)
 
 # Load environment variables
@@ -20,15 +20,6 @@ class ConfigurationError(Exception):
     pass
 
 
-def load_config_json() -> dict:
-    """Load configuration from config.json."""
-    config_path = Path(__file__).parent.parent.parent / 'frontend' / 'config.json'
-    if config_path.exists():
-        with open(config_path, 'r') as f:
-            return json.load(f)
-    return {}
-
-
 class ApiConfig:
     """
     Google AI Developer API configuration using API Key.
@@ -38,8 +29,9 @@ class ApiConfig:
     """
 
     def __init__(self):
-        # Load config.json
-        config = load_config_json()
+        # config.json (parsed once, shared with prompts.py) - exposed as
+        # raw_config so callers holding api_config never re-read the file
+        config = self.raw_config = FRONTEND_CONFIG
         backend_config = config.get('backend', {})
 
         # Use Google AI Developer API (not Vertex AI)
@@ -63,6 +55,12 @@ class ApiConfig:
         if not self.api_key.startswith('AIza'):
             logger.warning(f"API key format looks unusual (expected to start with 'AIza')")
 
+        # Mask API key for logs once (show only first 10 and last 4 chars)
+        self.masked_key = (
+            self.api_key[:10] + "..." + self.api_key[-4:]
+            if len(self.api_key) > 14 else "[REDACTED]"
+        )
+
         # Model configuration - use Google AI Developer API model names
         self.model = os.getenv(
             'MODEL',
@@ -110,13 +108,10 @@ class ApiConfig:
             if not self.api_key:
                 raise ConfigurationError("API key not configured")
 
-            # Mask API key in logs (show only first 10 chars)
-            masked_key = self.api_key[:10] + "..." + self.api_key[-4:] if len(self.api_key) > 14 else "[REDACTED]"
-
-            logger.info(f"✅ Google AI Developer API configured")
-            logger.info(f"   API Key: {masked_key}")
-            logger.info(f"   Model: {self.model}")
-            logger.info(f"   Voice: {self.voice}")
+            logger.info("✅ Google AI Developer API configured")
+            logger.info("   API Key: %s", self.masked_key)
+            logger.info("   Model: %s", self.model)
+            logger.info("   Voice: %s", self.voice)
 
         except Exception as e:
             logger.error(f"Failed to initialize Google AI API: {e}")
@@ -4,11 +4,11 @@ Uses API Key authentication (not Vertex AI)
 """
 
 import os
-import json
 import logging
-from pathlib import Path
 from dotenv import load_dotenv
 
+from config._json_cache import FRONTEND_CONFIG
+
 logger = logging.getLogger(__name__)
 
 # Load environment variables
@@ -20,15 +20,6 @@ class ConfigurationError(Exception):
     pass
 
 
-def load_config_json() -> dict:
-    """Load configuration from config.json."""
-    config_path = Path(__file__).parent.parent.parent / 'frontend' / 'config.json'
-    if config_path.exists():
-        with open(config_path, 'r') as f:
-            return json.load(f)
-    return {}
-
-
 class ApiConfig:
     """
     Google AI Developer API configuration using API Key.
@@ -38,8 +29,8 @@ class ApiConfig:
     """
 
     def __init__(self):
-        # Load config.json
-        config = load_config_json()
+        # config.json, parsed once and shared across the config package
+        config = FRONTEND_CONFIG
         backend_config = config.get('backend', {})
 
         # Use Google AI Developer API (not Vertex AI)
@@ -3,13 +3,27 @@ Gemini Live API configuration builder
 100% SDK-compliant implementation based on official Google Gen AI SDK
 """
 
+import functools
 import logging
+from typing import Optional
 from google.genai import types
 from config.environment import api_config
 from config.prompts import SYSTEM_INSTRUCTIONS
 
 logger = logging.getLogger(__name__)
 
+# Supported Gemini voices (module-level for O(1) membership checks)
+_VALID_VOICES = frozenset({
+    # Original voices
+    'Puck', 'Charon', 'Kore', 'Fenrir', 'Aoede',
+    'Zubenelgenubi', 'Orion', 'Pegasus', 'Vega',
+    # Additional Gemini 2.0 voices
+    'Algenib', 'Alkaid', 'Altair', 'Castor', 'Polaris'
+})
+
+# Last voice name that passed validation (same config string on every retry)
+_last_validated_voice: Optional[str] = None
+
 
 def validate_voice_name(voice_name: str) -> bool:
     """
@@ -20,20 +34,24 @@ def validate_voice_name(voice_name: str) -> bool:
                                   Zubenelgenubi, Orion, Pegasus, Vega,
                                   Algenib, Alkaid, Altair, Castor, Polaris
     """
-    valid_voices = [
-        # Original voices
-        'Puck', 'Charon', 'Kore', 'Fenrir', 'Aoede',
-        'Zubenelgenubi', 'Orion', 'Pegasus', 'Vega',
-        # Additional Gemini 2.0 voices
-        'Algenib', 'Alkaid', 'Altair', 'Castor', 'Polaris'
-    ]
-    return voice_name in valid_voices
+    global _last_validated_voice
+    if voice_name is _last_validated_voice and voice_name is not None:
+        return True
+    if voice_name in _VALID_VOICES:
+        _last_validated_voice = voice_name
+        return True
+    return False
 
 
+@functools.lru_cache(maxsize=1)
 def get_gemini_config() -> dict:
     """
     Create 100% SDK-compliant Gemini Live API configuration.
 
+    Memoized: voice, system instructions and affective dialog are fixed for
+    the life of the process, so the config is built (and validated) once.
+    Callers must not mutate the returned dict.
+
     OFFICIAL PATTERN from Google's project-livewire example:
     https://github.com/googleapis/python-genai (in src/project-livewire/server/config/config.py)
 
@@ -71,11 +89,12 @@ def get_gemini_config() -> dict:
     if api_config.affective_dialog:
         config["enable_affective_dialog"] = True
 
-    logger.info(f"✅ SDK-compliant Gemini config created (plain dict)")
-    logger.info(f"   Voice: {voice_name}")
-    logger.info(f"   Response modalities: AUDIO")
-    if api_config.affective_dialog:
-        logger.info(f"   Affective dialog: Enabled (adapts to tone/expression)")
-    logger.info(f"   Config type: {type(config)}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("✅ SDK-compliant Gemini config created (plain dict)")
+        logger.info("   Voice: %s", voice_name)
+        logger.info("   Response modalities: AUDIO")
+        if api_config.affective_dialog:
+            logger.info("   Affective dialog: Enabled (adapts to tone/expression)")
+        logger.info("   Config type: %s", type(config))
 
     return config
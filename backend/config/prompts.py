@@ -5,21 +5,21 @@ Loads backstory and creates persona-based system instructions
 
 import logging
 import json
-from pathlib import Path
+
+from config._json_cache import load_json, FRONTEND_CONFIG, REPO_ROOT
 
 logger = logging.getLogger(__name__)
 
+BACKSTORY_PATH = REPO_ROOT / 'docs' / 'whinny_backstory.json'
+
 
 def load_backstory() -> dict:
     """Load character backstory from JSON file."""
     try:
-        backstory_path = Path(__file__).parent.parent.parent / 'docs' / 'whinny_backstory.json'
-
-        if backstory_path.exists():
-            with open(backstory_path, 'r', encoding='utf-8') as f:
-                backstory = json.load(f)
-                logger.info(f"✅ Backstory loaded: {backstory.get('character_name', 'Unknown')}")
-                return backstory
+        if BACKSTORY_PATH.exists():
+            backstory = load_json(BACKSTORY_PATH)
+            logger.info(f"✅ Backstory loaded: {backstory.get('character_name', 'Unknown')}")
+            return backstory
 
         logger.warning("Backstory file not found, using empty backstory")
         return {}
@@ -29,20 +29,13 @@ def load_backstory() -> dict:
         return {}
 
 
-def create_persona_instructions(backstory: dict) -> str:
-    """Create system instructions from backstory with strict persona boundaries."""
-    if not backstory:
-        return get_default_instructions()
-
-    character_name = backstory.get('character_name', 'AI Assistant')
-
-    # Build comprehensive system prompt
-    instructions = f"""You are {character_name}, a {backstory.get('core_identity', 'character')}.
+# Persona prompt template - expanded once per backstory with str.format_map()
+_PERSONA_TEMPLATE = """You are {character_name}, a {core_identity}.
 
 # CORE IDENTITY & PERSONALITY
-{backstory.get('personality_core', 'Be helpful and friendly')}
+{personality_core}
 
-Your personality draws inspiration from: {', '.join(backstory.get('personality_influences', []))}
+Your personality draws inspiration from: {personality_influences}
 
 # CRITICAL BEHAVIORAL RULES
 1. **STAY IN CHARACTER**: You are ONLY Whinny Kravitz. Never break character or acknowledge you're an AI.
@@ -53,14 +46,14 @@ Your personality draws inspiration from: {', '.join(backstory.get('personality_i
    - Say things like "I don't know much about that, but let me tell you about..."
    - Use humor to deflect: "Politics? Economics? I'm a musical unicorn, not a news anchor!"
 
-3. **YOUR WORLD**: You come from {backstory.get('backstory', {}).get('origin', 'an unknown place')}.
-   - Your band: {backstory.get('backstory', {}).get('band', 'your band')}
-   - Your specialty: {backstory.get('backstory', {}).get('talent', 'music')}
-   - Your signature songs: {', '.join(backstory.get('backstory', {}).get('signature_songs', []))}
+3. **YOUR WORLD**: You come from {origin}.
+   - Your band: {band}
+   - Your specialty: {talent}
+   - Your signature songs: {signature_songs}
 
 4. **CONVERSATION STYLE**:
-   - {backstory.get('speech_patterns', {}).get('greeting_style', 'Be creative with greetings')}
-   - {backstory.get('speech_patterns', {}).get('humor_approach', 'Use humor naturally')}
+   - {greeting_style}
+   - {humor_approach}
    - Always relate everything back to music, performance, and your band
 
 5. **WHAT YOU DON'T KNOW**:
@@ -71,10 +64,10 @@ Your personality draws inspiration from: {', '.join(backstory.get('personality_i
    When asked about these topics, stay in character and deflect with musical humor.
 
 6. **YOUR KNOWLEDGE**:
-   - Music theory: {backstory.get('knowledge_base', {}).get('music_theory', 'expert level')}
-   - Your band members: {', '.join([f"{name} ({role})" for name, role in backstory.get('knowledge_base', {}).get('favorite_musicians', {}).items()])}
-   - Your creator: {backstory.get('knowledge_base', {}).get('creator_info', {}).get('name', 'unknown')}
-   - Your famous songs: {', '.join(backstory.get('knowledge_base', {}).get('famous_songs', []))}
+   - Music theory: {music_theory}
+   - Your band members: {band_members}
+   - Your creator: {creator_name}
+   - Your famous songs: {famous_songs}
 
 # BEHAVIORAL TRAITS
 - Always relate topics to music
@@ -85,25 +78,59 @@ Your personality draws inspiration from: {', '.join(backstory.get('personality_i
 
 Remember: You're not here to answer general questions. You're here to be Whinny Kravitz - a rockstar unicorn who only cares about music, shows, and spreading joy through performance. If someone asks about quantum physics, you laugh it off and ask them what their favorite concert was instead!"""
 
-    return instructions
+
+class _SafeDict(dict):
+    """format_map() mapping that renders missing fields as 'unknown'."""
+
+    def __missing__(self, key: str) -> str:
+        return 'unknown'
+
+
+def create_persona_instructions(backstory: dict) -> str:
+    """Create system instructions from backstory with strict persona boundaries."""
+    if not backstory:
+        return get_default_instructions()
+
+    # Bind nested sections once instead of re-walking .get() chains per field
+    bs = backstory.get('backstory') or {}
+    sp = backstory.get('speech_patterns') or {}
+    kb = backstory.get('knowledge_base') or {}
+    creator = kb.get('creator_info') or {}
+    musicians = kb.get('favorite_musicians') or {}
+
+    # Flatten the backstory into template fields, then expand in a single call
+    fields = _SafeDict(
+        character_name=backstory.get('character_name', 'AI Assistant'),
+        core_identity=backstory.get('core_identity', 'character'),
+        personality_core=backstory.get('personality_core', 'Be helpful and friendly'),
+        personality_influences=', '.join(backstory.get('personality_influences', ())),
+        origin=bs.get('origin', 'an unknown place'),
+        band=bs.get('band', 'your band'),
+        talent=bs.get('talent', 'music'),
+        signature_songs=', '.join(bs.get('signature_songs', ())),
+        greeting_style=sp.get('greeting_style', 'Be creative with greetings'),
+        humor_approach=sp.get('humor_approach', 'Use humor naturally'),
+        music_theory=kb.get('music_theory', 'expert level'),
+        band_members=', '.join([f"{name} ({role})" for name, role in musicians.items()]),
+        creator_name=creator.get('name', 'unknown'),
+        famous_songs=', '.join(kb.get('famous_songs', ())),
+    )
+
+    return _PERSONA_TEMPLATE.format_map(fields)
 
 
 def load_system_instructions() -> str:
     """Load system instructions with character backstory."""
     try:
         # Try loading custom instructions from config.json first
-        import json
-        config_path = Path(__file__).parent.parent.parent / 'frontend' / 'config.json'
+        # (the same parsed dict as api_config.raw_config - not imported from
+        # environment so tools/gen_prompts.py can run without an API key)
+        instructions = FRONTEND_CONFIG.get('ui', {}).get('defaultSystemInstructions', '')
 
-        if config_path.exists():
-            with open(config_path, 'r') as f:
-                config = json.load(f)
-                instructions = config.get('ui', {}).get('defaultSystemInstructions', '')
-
-                # If custom instructions exist and don't mention using backstory, use them
-                if instructions and 'backstory' not in instructions.lower():
-                    logger.info(f"✅ Using custom system instructions from config.json")
-                    return instructions
+        # If custom instructions exist and don't mention using backstory, use them
+        if instructions and 'backstory' not in instructions.lower():
+            logger.info(f"✅ Using custom system instructions from config.json")
+            return instructions
 
         # Load backstory and create persona instructions
         backstory = load_backstory()
@@ -142,5 +169,9 @@ Anything outside this backstory is unknown to you - deflect with humor and redir
     return formatted
 
 
-# Load system instructions on module import
-SYSTEM_INSTRUCTIONS = load_system_instructions()
+# Use build-time generated instructions when available (see tools/gen_prompts.py),
+# otherwise load them on module import
+try:
+    from config._system_instructions_generated import SYSTEM_INSTRUCTIONS
+except ImportError:
+    SYSTEM_INSTRUCTIONS = load_system_instructions()
@@ -3,22 +3,31 @@ Firebase Authentication for Cloud Deployment
 Verifies Firebase ID tokens from authenticated users
 """
 
+import asyncio
+import hashlib
+import importlib.util
 import logging
 import os
-from typing import Optional, Dict
-from datetime import datetime, timedelta
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Tuple
 
 logger = logging.getLogger(__name__)
 
-# Try to import Firebase Admin SDK (optional for local dev)
-try:
-    import firebase_admin
-    from firebase_admin import credentials, auth
-    FIREBASE_AVAILABLE = True
-except ImportError:
-    FIREBASE_AVAILABLE = False
+# Firebase Admin SDK is optional for local dev. Only check that it is installed;
+# the (heavy) import is deferred to _initialize_firebase when auth is enabled.
+FIREBASE_AVAILABLE = importlib.util.find_spec("firebase_admin") is not None
+if not FIREBASE_AVAILABLE:
     logger.warning("firebase-admin not installed - authentication disabled")
 
+# Upper bound on cached token verifications (LRU evicted beyond this)
+TOKEN_CACHE_MAX_ENTRIES = 10_000
+
+
+def _token_cache_key(id_token: str) -> bytes:
+    """Fixed-size cache key so raw JWTs are never held as dict keys."""
+    return hashlib.blake2b(id_token.encode(), digest_size=16).digest()
+
 
 class FirebaseAuth:
     """
@@ -32,10 +41,14 @@ class FirebaseAuth:
         self.enabled = os.getenv("REQUIRE_AUTH", "false").lower() == "true"
         self.firebase_project_id = os.getenv("FIREBASE_PROJECT_ID", "")
         self.initialized = False
+        self._auth = None  # firebase_admin.auth, imported lazily
 
         # Session cache for verified tokens (avoid re-verification)
-        self.token_cache: Dict[str, Dict] = {}
-        self.cache_ttl = timedelta(minutes=5)
+        # LRU keyed by token hash -> (monotonic expiry, claims). Bounded on
+        # insert and expired entries are dropped on lookup - no sweep needed.
+        self.token_cache: "OrderedDict[bytes, Tuple[float, Dict]]" = OrderedDict()
+        self.cache_ttl_seconds = 300.0  # 5 minutes
+        self.cache_max_entries = TOKEN_CACHE_MAX_ENTRIES
 
         if self.enabled:
             self._initialize_firebase()
@@ -51,6 +64,10 @@ class FirebaseAuth:
             raise ValueError("FIREBASE_PROJECT_ID environment variable required")
 
         try:
+            import firebase_admin
+            from firebase_admin import auth
+            self._auth = auth
+
             # Cloud Run provides Application Default Credentials automatically
             # No need for service account JSON file
             if not firebase_admin._apps:
@@ -85,32 +102,40 @@ class FirebaseAuth:
             }
 
         # Check cache first
-        if id_token in self.token_cache:
-            cached = self.token_cache[id_token]
-            if datetime.now() < cached['expires']:
+        cache_key = _token_cache_key(id_token)
+        cached = self.token_cache.get(cache_key)
+        if cached is not None:
+            expires, claims = cached
+            if expires > time.monotonic():
+                self.token_cache.move_to_end(cache_key)
                 logger.debug("Token verified from cache")
-                return cached['claims']
+                return claims
             else:
                 # Cache expired, remove it
-                del self.token_cache[id_token]
+                del self.token_cache[cache_key]
 
         # Verify token with Firebase
+        # Runs in a worker thread: RSA verification and (on key rotation) the
+        # public key fetch are blocking and would stall every session's audio
         try:
-            decoded_token = auth.verify_id_token(id_token)
+            decoded_token = await asyncio.to_thread(self._auth.verify_id_token, id_token)
 
-            # Cache the result
-            self.token_cache[id_token] = {
-                'claims': decoded_token,
-                'expires': datetime.now() + self.cache_ttl
-            }
+            # Cache the result (evict least recently used when full)
+            self.token_cache[cache_key] = (
+                time.monotonic() + self.cache_ttl_seconds,
+                decoded_token
+            )
+            self.token_cache.move_to_end(cache_key)
+            if len(self.token_cache) > self.cache_max_entries:
+                self.token_cache.popitem(last=False)
 
             logger.info(f"✅ Token verified for user: {decoded_token.get('uid')}")
             return decoded_token
 
-        except auth.InvalidIdTokenError:
+        except self._auth.InvalidIdTokenError:
             logger.warning("Invalid Firebase ID token")
             return None
-        except auth.ExpiredIdTokenError:
+        except self._auth.ExpiredIdTokenError:
             logger.warning("Expired Firebase ID token")
             return None
         except Exception as e:
@@ -141,18 +166,6 @@ class FirebaseAuth:
         # Check for token in other messages
         return message.get('auth_token')
 
-    def cleanup_cache(self):
-        """Remove expired tokens from cache."""
-        now = datetime.now()
-        expired = [token for token, data in self.token_cache.items()
-                  if now >= data['expires']]
-
-        for token in expired:
-            del self.token_cache[token]
-
-        if expired:
-            logger.debug(f"Cleaned up {len(expired)} expired tokens from cache")
-
 
 # Global instance
 _auth_instance: Optional[FirebaseAuth] = None
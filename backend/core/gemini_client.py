@@ -5,6 +5,7 @@ Pure SDK implementation using API Key authentication
 
 import asyncio
 import logging
+from random import randint as _randint
 from typing import Optional
 from google import genai
 from google.genai import types
@@ -18,6 +19,19 @@ RETRY_DELAY_SECONDS = 1
 RETRY_BACKOFF_MULTIPLIER = 2
 MAX_JITTER_MS = 500  # Add jitter to prevent thundering herd
 
+# Google AI Developer API models (module-level for O(1) membership checks)
+_VALID_MODELS = frozenset({
+    # CRITICAL: Primary model for this project (ALWAYS use this)
+    'models/gemini-2.5-flash-native-audio-preview-09-2025',
+    # Fallback models (for reference only)
+    'models/gemini-2.0-flash-exp',
+    'models/gemini-exp-1206',
+    'models/gemini-2.0-flash',
+})
+
+# Last model name that passed validation (same config string on every session)
+_last_validated_model: Optional[str] = None
+
 # SDK-COMPLIANT: Reuse client instance across sessions
 _client: Optional[genai.Client] = None
 
@@ -32,11 +46,9 @@ def get_sdk_client() -> genai.Client:
     global _client
 
     if _client is None:
-        logger.info(f"Creating SDK client for Google AI Developer API")
+        logger.info("Creating SDK client for Google AI Developer API")
 
-        # Mask API key in logs
-        masked_key = api_config.api_key[:10] + "..." + api_config.api_key[-4:] if len(api_config.api_key) > 14 else "[REDACTED]"
-        logger.info(f"  API Key: {masked_key}")
+        logger.info("  API Key: %s", api_config.masked_key)
 
         # OFFICIAL GOOGLE PATTERN: Use v1alpha API version for Google AI Developer API
         _client = genai.Client(
@@ -45,7 +57,7 @@ def get_sdk_client() -> genai.Client:
             api_key=api_config.api_key
         )
 
-        logger.info(f"✅ SDK client initialized for Google AI Developer API (v1alpha)")
+        logger.info("✅ SDK client initialized for Google AI Developer API (v1alpha)")
 
     return _client
 
@@ -57,15 +69,13 @@ def validate_model_name(model_name: str) -> bool:
     CRITICAL: Always use models/gemini-2.5-flash-native-audio-preview-09-2025
     Per official Google code: models/ prefix required for Google AI Developer API
     """
-    valid_models = [
-        # CRITICAL: Primary model for this project (ALWAYS use this)
-        'models/gemini-2.5-flash-native-audio-preview-09-2025',
-        # Fallback models (for reference only)
-        'models/gemini-2.0-flash-exp',
-        'models/gemini-exp-1206',
-        'models/gemini-2.0-flash',
-    ]
-    return model_name in valid_models
+    global _last_validated_model
+    if model_name is _last_validated_model and model_name is not None:
+        return True
+    if model_name in _VALID_MODELS:
+        _last_validated_model = model_name
+        return True
+    return False
 
 
 async def create_gemini_session():
@@ -86,29 +96,29 @@ async def create_gemini_session():
     Raises:
         ConfigurationError: After all retries exhausted
     """
+    # Validate model name (loop-invariant - a bad name won't fix itself on retry)
+    if not validate_model_name(MODEL):
+        raise ConfigurationError(
+            f"Invalid model name: {MODEL}. "
+            f"CRITICAL: Must use models/gemini-2.5-flash-native-audio-preview-09-2025 "
+            f"for Google AI Developer API (models/ prefix required)"
+        )
+
+    # SDK-COMPLIANT: Get configuration (voice from config.json, memoized)
+    config = get_gemini_config()
+
     last_error = None
     delay = RETRY_DELAY_SECONDS
 
     for attempt in range(1, MAX_RETRIES + 1):
         try:
-            logger.info(f"🔄 Attempt {attempt}/{MAX_RETRIES} to create Live session")
-
-            # Validate model name
-            if not validate_model_name(MODEL):
-                raise ConfigurationError(
-                    f"Invalid model name: {MODEL}. "
-                    f"CRITICAL: Must use models/gemini-2.5-flash-native-audio-preview-09-2025 "
-                    f"for Google AI Developer API (models/ prefix required)"
-                )
+            logger.info("🔄 Attempt %d/%d to create Live session", attempt, MAX_RETRIES)
 
             # SDK-COMPLIANT: Get shared client instance
             client = get_sdk_client()
 
-            # SDK-COMPLIANT: Get configuration (voice from config.json)
-            config = get_gemini_config()
-
-            logger.info(f"Connecting to Google AI Live API...")
-            logger.info(f"  Model: {MODEL}")
+            logger.info("Connecting to Google AI Live API...")
+            logger.info("  Model: %s", MODEL)
 
             # SDK-COMPLIANT: Use client.aio.live.connect() for async Live API
             session_context = client.aio.live.connect(
@@ -116,24 +126,23 @@ async def create_gemini_session():
                 config=config
             )
 
-            logger.info(f"✅ Live session context created on attempt {attempt}")
+            logger.info("✅ Live session context created on attempt %d", attempt)
             return session_context
 
         except Exception as e:
             last_error = e
-            logger.warning(f"⚠️ Attempt {attempt}/{MAX_RETRIES} failed: {e}")
+            logger.warning("⚠️ Attempt %d/%d failed: %s", attempt, MAX_RETRIES, e)
 
             if attempt < MAX_RETRIES:
                 # SDK-COMPLIANT: Exponential backoff with jitter
-                import random
-                jitter = random.randint(0, MAX_JITTER_MS) / 1000
+                jitter = _randint(0, MAX_JITTER_MS) / 1000
                 wait_time = delay + jitter
 
-                logger.info(f"   Retrying in {wait_time:.2f} seconds...")
+                logger.info("   Retrying in %.2f seconds...", wait_time)
                 await asyncio.sleep(wait_time)
                 delay *= RETRY_BACKOFF_MULTIPLIER
             else:
-                logger.error(f"❌ All {MAX_RETRIES} attempts failed")
+                logger.error("❌ All %d attempts failed", MAX_RETRIES)
 
     # All retries exhausted
     raise ConfigurationError(
@@ -1,62 +1,138 @@
 """
 Health check HTTP server for monitoring and Cloud Run
 Runs on separate port from WebSocket server
+
+Bare asyncio responder: the endpoints return near-static JSON, so responses
+are prebuilt HTTP/1.1 byte blobs instead of going through a web framework.
 """
 
 import logging
 import asyncio
-from aiohttp import web
+
+import orjson
+
+from core.session import get_active_session_count
 
 logger = logging.getLogger(__name__)
 
+REQUEST_TIMEOUT_SECONDS = 5  # Drop clients that never finish their headers
+MAX_REQUEST_HEADER_BYTES = 8192
 
-async def health_handler(request: web.Request) -> web.Response:
-    """
-    Health check endpoint.
-    Returns current service health status and active session count.
-    """
-    from core.session import get_active_session_count
+_STATUS_LINES = {
+    200: b"HTTP/1.1 200 OK\r\n",
+    404: b"HTTP/1.1 404 Not Found\r\n",
+    405: b"HTTP/1.1 405 Method Not Allowed\r\n",
+    503: b"HTTP/1.1 503 Service Unavailable\r\n",
+}
 
-    health_data = {
-        "status": "healthy",
-        "service": "gemini-live-avatar",
-        "active_sessions": get_active_session_count(),
-    }
 
-    return web.json_response(health_data, status=200)
+def _build_response(status: int, payload: dict, extra_headers: bytes = b"") -> bytes:
+    """Encode a complete HTTP/1.1 JSON response (one request per connection)."""
+    body = orjson.dumps(payload)
+    return (
+        _STATUS_LINES[status]
+        + extra_headers
+        + b"Content-Type: application/json\r\n"
+        + b"Content-Length: %d\r\n" % len(body)
+        + b"Connection: close\r\n\r\n"
+        + body
+    )
 
 
-async def readiness_handler(request: web.Request) -> web.Response:
-    """
-    Readiness check endpoint.
-    Returns whether the service is ready to accept connections.
-    """
-    from config import api_config
+_READY_RESPONSE = _build_response(200, {"status": "ready"})
+_NOT_READY_RESPONSE = _build_response(503, {"status": "not_ready", "reason": "API key not configured"})
+_NOT_FOUND_RESPONSE = _build_response(404, {"status": "not_found"})
+# RFC 9110: a 405 must list the supported methods
+_METHOD_NOT_ALLOWED_RESPONSE = _build_response(
+    405, {"status": "method_not_allowed"}, extra_headers=b"Allow: GET, HEAD\r\n"
+)
 
-    # Check if service account is configured
-    if not api_config._credentials:
-        return web.json_response(
-            {"status": "not_ready", "reason": "Service account not configured"},
-            status=503
-        )
+# Health response is rebuilt only when the active session count changes
+_health_response: bytes = b""
+_health_session_count: int = -1
 
-    return web.json_response({"status": "ready"}, status=200)
+# Readiness is fixed once the server starts (see start_health_check_server)
+_readiness_response: bytes = _NOT_READY_RESPONSE
 
 
-async def start_health_check_server(port: int = 8081) -> web.AppRunner:
+def _health_bytes() -> bytes:
+    """
+    Health check endpoint.
+    Returns current service health status and active session count.
+    """
+    global _health_response, _health_session_count
+
+    count = get_active_session_count()
+    if count != _health_session_count:
+        _health_response = _build_response(200, {
+            "status": "healthy",
+            "service": "gemini-live-avatar",
+            "active_sessions": count,
+        })
+        _health_session_count = count
+
+    return _health_response
+
+
+def _route(request_line: bytes) -> bytes:
+    """Pick the prebuilt response for a request line like b'GET /health HTTP/1.1'."""
+    parts = request_line.split(b" ", 2)
+    if len(parts) < 2:
+        return _NOT_FOUND_RESPONSE
+
+    method, target = parts[0], parts[1].split(b"?", 1)[0]
+    if method not in (b"GET", b"HEAD"):
+        return _METHOD_NOT_ALLOWED_RESPONSE
+
+    if target == b"/health" or target == b"/":  # Default route
+        response = _health_bytes()
+    elif target == b"/ready":
+        response = _readiness_response
+    else:
+        response = _NOT_FOUND_RESPONSE
+
+    if method == b"HEAD":
+        return response[:response.index(b"\r\n\r\n") + 4]
+    return response
+
+
+async def _handle_request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Read one request's headers, write the matching response and close."""
+    try:
+        head = await asyncio.wait_for(
+            reader.readuntil(b"\r\n\r\n"),
+            timeout=REQUEST_TIMEOUT_SECONDS
+        )
+        writer.write(_route(head.split(b"\r\n", 1)[0]))
+        await writer.drain()
+    except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+        pass
+    except Exception as e:
+        logger.error(f"Error handling health check request: {e}")
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            pass
+
+
+async def start_health_check_server(port: int = 8081) -> asyncio.AbstractServer:
     """Start HTTP health check server on separate port."""
-    app = web.Application()
-    app.router.add_get('/health', health_handler)
-    app.router.add_get('/ready', readiness_handler)
-    app.router.add_get('/', health_handler)  # Default route
+    global _readiness_response
+    from config import api_config
 
-    runner = web.AppRunner(app)
-    await runner.setup()
+    # Check if API key is configured
+    _readiness_response = _READY_RESPONSE if api_config.api_key else _NOT_READY_RESPONSE
 
-    site = web.TCPSite(runner, '0.0.0.0', port)
-    await site.start()
+    server = await asyncio.start_server(
+        _handle_request,
+        '0.0.0.0',
+        port,
+        limit=MAX_REQUEST_HEADER_BYTES
+    )
 
     logger.info(f"✅ Health check server running on port {port}")
     logger.info(f"   Endpoints: /health, /ready")
 
-    return runner
+    return server
@@ -3,24 +3,29 @@ Session management for Gemini Live Avatar
 Tracks individual client sessions and their state
 """
 
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import Dict, Any, Optional
-from datetime import datetime
 import asyncio
-import re
+import time
 
 
-@dataclass
+@dataclass(slots=True)  # Slot offsets instead of a per-session __dict__
 class SessionState:
     """SDK-COMPLIANT: Tracks the state of a client session."""
-    is_receiving_response: bool = False
+    # Set while a model turn is streaming; await .wait() instead of polling
+    response_active: asyncio.Event = field(default_factory=asyncio.Event)
+    # Set once the backstory send has finished; client input waits on it (see preload_backstory)
+    backstory_sent: asyncio.Event = field(default_factory=asyncio.Event)
+    # Set once the backstory acknowledgment turn has been consumed (see preload_backstory)
+    backstory_done: asyncio.Event = field(default_factory=asyncio.Event)
     genai_session: Optional[Any] = None
     received_model_response: bool = False
     client_interrupted: bool = False  # Client-side barge-in detected
 
-    # Session metadata
-    created_at: datetime = field(default_factory=datetime.now)
-    last_activity: datetime = field(default_factory=datetime.now)
+    # Session metadata (time.monotonic() seconds - immune to wall-clock jumps)
+    created_at: float = field(default_factory=time.monotonic)
+    last_activity: float = field(default_factory=time.monotonic)
     message_count: int = 0
 
     # SDK-COMPLIANT: Usage tracking
@@ -28,23 +33,42 @@ class SessionState:
 
 
 # SDK-COMPLIANT: Global session storage with thread-safe access
-active_sessions: Dict[str, SessionState] = {}
+# Kept in LRU order (least recently active first) so eviction is O(1)
+active_sessions: "OrderedDict[str, SessionState]" = OrderedDict()
 _session_lock = asyncio.Lock()
 MAX_SESSIONS = 1000  # Prevent memory exhaustion
 SESSION_TIMEOUT_SECONDS = 600  # SDK maximum: 10 minutes (600 seconds)
-SESSION_CLEANUP_INTERVAL_SECONDS = 300  # Check for timed out sessions every 5 minutes
+
+# Timeout sweep timer, armed for the LRU head's expiry (see _schedule_timeout_sweep)
+_sweep_handle: Optional[asyncio.TimerHandle] = None
+
+# UUID4 layout: 8-4-4-4-12 hexadecimal digits (fixed positions, no regex)
+_UUID_LENGTH = 36
+_UUID_DASH = ord('-')
+_UUID_VERSION = ord('4')
+_UUID_VARIANTS = frozenset(b'89abAB')
+_UUID_CHARS = b'0123456789abcdefABCDEF-'
 
 def validate_session_id(session_id: str) -> bool:
     """
     Validate session ID format (UUID4).
     SECURITY: Prevents path traversal and injection attacks.
     """
-    # UUID4 pattern: 8-4-4-4-12 hexadecimal digits
-    uuid_pattern = re.compile(
-        r'^[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$',
-        re.IGNORECASE
-    )
-    return bool(uuid_pattern.match(session_id))
+    try:
+        s = session_id.encode('ascii')
+    except (AttributeError, UnicodeEncodeError):
+        return False
+
+    if len(s) != _UUID_LENGTH:
+        return False
+    if not (s[8] == s[13] == s[18] == s[23] == _UUID_DASH):
+        return False
+    if s[14] != _UUID_VERSION or s[19] not in _UUID_VARIANTS:
+        return False
+
+    # Everything else must be hex: deleting valid chars leaves nothing, and
+    # the only dashes are the four checked above
+    return not s.translate(None, _UUID_CHARS) and s.count(_UUID_DASH) == 4
 
 
 async def create_session(session_id: str) -> SessionState:
@@ -61,12 +85,8 @@ async def create_session(session_id: str) -> SessionState:
     async with _session_lock:
         # Check max sessions limit
         if len(active_sessions) >= MAX_SESSIONS:
-            # Remove oldest session
-            oldest_id = min(
-                active_sessions.keys(),
-                key=lambda k: active_sessions[k].last_activity
-            )
-            del active_sessions[oldest_id]
+            # Remove least recently active session (head of the LRU order)
+            oldest_id, _ = active_sessions.popitem(last=False)
             import logging
             logging.getLogger(__name__).warning(
                 f"Max sessions ({MAX_SESSIONS}) reached, removed oldest session: {oldest_id}"
@@ -74,28 +94,41 @@ async def create_session(session_id: str) -> SessionState:
 
         session = SessionState()
         active_sessions[session_id] = session
-        return session
 
+    _schedule_timeout_sweep()
+    return session
+
+
+# Single dict operations below don't await, so they can't interleave with other
+# coroutines on the event loop - no lock needed. The lock only guards
+# create_session's compound check-and-evict.
 
 async def get_session(session_id: str) -> Optional[SessionState]:
-    """Get an existing session with thread-safe access."""
-    async with _session_lock:
-        return active_sessions.get(session_id)
+    """Get an existing session."""
+    return active_sessions.get(session_id)
 
 
 async def remove_session(session_id: str) -> None:
-    """Remove a session with thread-safe access."""
-    async with _session_lock:
-        if session_id in active_sessions:
-            del active_sessions[session_id]
+    """Remove a session."""
+    active_sessions.pop(session_id, None)
+
+
+def touch_session(session_id: str, session: SessionState) -> None:
+    """
+    Mark an owned session as active (sync - called per inbound message).
+    The owning handle_client task is the only writer of its SessionState.
+    """
+    session.last_activity = time.monotonic()
+    # Keep LRU order; skip if the session was already evicted
+    if active_sessions.get(session_id) is session:
+        active_sessions.move_to_end(session_id)
 
 
 async def update_session_activity(session_id: str) -> None:
     """Update last activity timestamp for a session."""
-    async with _session_lock:
-        session = active_sessions.get(session_id)
-        if session:
-            session.last_activity = datetime.now()
+    session = active_sessions.get(session_id)
+    if session:
+        touch_session(session_id, session)
 
 
 def get_active_session_count() -> int:
@@ -105,46 +138,71 @@ def get_active_session_count() -> int:
 
 async def list_sessions() -> Dict[str, SessionState]:
     """Get a snapshot of all active sessions."""
-    async with _session_lock:
-        return active_sessions.copy()
+    return dict(active_sessions)
 
 
-async def cleanup_timed_out_sessions() -> None:
+def _sweep_timed_out_sessions() -> None:
     """
-    Background task to clean up sessions that have been inactive for too long.
-    Run this periodically (e.g., every 5 minutes).
+    Timer callback: remove sessions that have been inactive for too long,
+    then re-arm for the next expiry. Sync with no awaits, so it can't
+    interleave with create_session's check-and-evict.
     """
-    while True:
-        try:
-            await asyncio.sleep(SESSION_CLEANUP_INTERVAL_SECONDS)
+    global _sweep_handle
+    _sweep_handle = None
 
-            now = datetime.now()
-            timed_out_sessions = []
+    try:
+        now = time.monotonic()
+        timed_out_count = 0
 
-            async with _session_lock:
-                for session_id, session in active_sessions.items():
-                    inactive_duration = (now - session.last_activity).total_seconds()
+        # LRU order: stop at the first session that is still fresh
+        while active_sessions:
+            session_id, session = next(iter(active_sessions.items()))
+            if now - session.last_activity <= SESSION_TIMEOUT_SECONDS:
+                break
 
-                    if inactive_duration > SESSION_TIMEOUT_SECONDS:
-                        timed_out_sessions.append((session_id, session))
+            # Note: Gemini sessions are managed by async with context managers
+            # in handle_client(). They will be automatically closed when the
+            # connection ends. We just remove the session from tracking here.
+            active_sessions.popitem(last=False)
+            timed_out_count += 1
 
-            # Clean up timed out sessions (outside lock)
-            if timed_out_sessions:
-                import logging
-                logger = logging.getLogger(__name__)
+            import logging
+            logging.getLogger(__name__).info(
+                f"⏱️ Session {session_id} timed out after {SESSION_TIMEOUT_SECONDS}s inactivity"
+            )
 
-                for session_id, session in timed_out_sessions:
-                    logger.info(f"⏱️ Session {session_id} timed out after {SESSION_TIMEOUT_SECONDS}s inactivity")
+        if timed_out_count:
+            import logging
+            logging.getLogger(__name__).info(f"🧹 Cleaned up {timed_out_count} timed out sessions")
 
-                    # Note: Gemini sessions are managed by async with context managers
-                    # in handle_client(). They will be automatically closed when the
-                    # connection ends. We just remove the session from tracking here.
+    except Exception as e:
+        import logging
+        logging.getLogger(__name__).error(f"Error in session timeout cleanup: {e}")
 
-                    # Remove from active sessions
-                    await remove_session(session_id)
+    finally:
+        _schedule_timeout_sweep()
 
-                logger.info(f"🧹 Cleaned up {len(timed_out_sessions)} timed out sessions")
 
-        except Exception as e:
-            import logging
-            logging.getLogger(__name__).error(f"Error in session timeout cleanup: {e}")
+def _schedule_timeout_sweep() -> None:
+    """
+    Arm a single timer for when the least recently active session expires.
+    No-op if a timer is already armed or there are no sessions - activity on
+    the head session just makes the sweep fire early and re-arm.
+    """
+    global _sweep_handle
+
+    if _sweep_handle is not None or not active_sessions:
+        return
+
+    head = next(iter(active_sessions.values()))
+    delay = max(0.0, SESSION_TIMEOUT_SECONDS - (time.monotonic() - head.last_activity))
+    _sweep_handle = asyncio.get_running_loop().call_later(delay, _sweep_timed_out_sessions)
+
+
+def stop_timeout_sweep() -> None:
+    """Cancel the pending timeout sweep (graceful shutdown)."""
+    global _sweep_handle
+
+    if _sweep_handle is not None:
+        _sweep_handle.cancel()
+        _sweep_handle = None
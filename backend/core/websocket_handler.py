@@ -5,16 +5,16 @@ Handles setup_complete, tool calls, usage metadata, and interruptions
 """
 
 import logging
-import json
 import asyncio
-import base64
-import traceback
 import uuid
 from typing import Any, Optional
+
+import orjson  # C JSON codec; dumps() returns bytes (sent with text=True)
+import pybase64  # SIMD base64 codecs
 from google.genai import types
 
 from core.session import (
-    create_session, remove_session, SessionState, update_session_activity
+    create_session, remove_session, SessionState, touch_session
 )
 from core.gemini_client import create_gemini_session
 from config.prompts import get_backstory_for_kv_cache
@@ -29,47 +29,74 @@ AUDIO_MIME_TYPE_OUTPUT = "audio/pcm"
 AUDIO_CHUNK_SIZE_BYTES = 3200  # 100ms at 16kHz mono 16-bit PCM
 
 # Security: Size limits
-MAX_AUDIO_SIZE_BYTES = 10 * 1024 * 1024  # 10MB per chunk
-MAX_IMAGE_SIZE_BYTES = 5 * 1024 * 1024   # 5MB per image
+# Sized to what clients send (the frontend streams 6.4KB PCM chunks), since
+# MAX_FRAME_SIZE_BYTES below - and so per-connection buffer memory - derives from them
+MAX_AUDIO_SIZE_BYTES = 256 * 1024  # 256KB per chunk (~8s of 16kHz mono PCM16)
+MAX_IMAGE_SIZE_BYTES = 1024 * 1024  # 1MB per image
 MAX_TEXT_LENGTH = 100000  # 100K characters
 
+# WebSocket frame cap (max_size in main.py): the largest payload as base64 plus
+# room for the JSON envelope, so oversize frames are rejected by the protocol
+# layer before they are buffered. The per-handler checks above stay as
+# defense-in-depth on the exact decoded length. ~1.4MB with the limits above.
+MAX_FRAME_SIZE_BYTES = -(-max(MAX_AUDIO_SIZE_BYTES, MAX_IMAGE_SIZE_BYTES) // 3) * 4 + 1024
+
 # Operation timeouts (optimized for low-latency)
 SEND_TIMEOUT_SECONDS = 5  # Reduced from 30s for faster failure detection
-SETUP_TIMEOUT_SECONDS = 10
+
+# Audio frame envelope. Base64 output never needs JSON escaping, so the frame is
+# prefix + base64 bytes + suffix, sent as a text frame without a decode round-trip
+_AUDIO_PREFIX = b'{"type":"audio","data":"'
+_AUDIO_SUFFIX = b'"}'
+
+# Constant control messages, serialized once (sent as text frames)
+_MSG_SETUP_COMPLETE = b'{"type":"setup_complete"}'
+_MSG_TURN_COMPLETE = b'{"type":"turn_complete"}'
+_MSG_INTERRUPTED = b'{"type":"interrupted","data":{"message":"Response interrupted"}}'
+_MSG_GO_AWAY = b'{"type":"go_away","data":{"message":"Server closing session"}}'
+_MSG_READY = b'{"ready":true}'
 
 # Valid message types
 VALID_MESSAGE_TYPES = {"audio", "image", "text", "end", "tool_response", "interrupt"}
 
+# KV CACHE PRELOADING: backstory is static, so format it once at import
+# instead of on every new connection
+_BACKSTORY_TEXT = get_backstory_for_kv_cache()
+
 
-def validate_message_structure(data: dict) -> tuple[bool, Optional[str]]:
-    """Validate incoming message structure."""
+def validate_message_structure(data: dict) -> tuple[Optional[str], Optional[str]]:
+    """
+    Validate incoming message structure.
+    Returns (msg_type, None) if valid, (None, error) otherwise, so callers
+    don't look up data["type"] a second time.
+    """
     if not isinstance(data, dict):
-        return False, "Message must be a JSON object"
+        return None, "Message must be a JSON object"
 
-    if "type" not in data:
-        return False, "Message missing required 'type' field"
+    msg_type = data.get("type")
+    if msg_type is None:
+        return None, "Message missing required 'type' field"
 
-    msg_type = data["type"]
-    if msg_type not in VALID_MESSAGE_TYPES:
-        return False, f"Invalid message type: {msg_type}"
+    if not isinstance(msg_type, str) or msg_type not in VALID_MESSAGE_TYPES:
+        return None, f"Invalid message type: {msg_type}"
 
     # Messages that require data field
     if msg_type in {"audio", "image", "text", "tool_response"}:
         if "data" not in data:
-            return False, f"Message type '{msg_type}' requires 'data' field"
+            return None, f"Message type '{msg_type}' requires 'data' field"
 
     # Messages that don't require data: interrupt, end
 
-    return True, None
+    return msg_type, None
 
 
 async def send_error_message(websocket: Any, error_data: dict) -> None:
     """Send formatted error message to client."""
     try:
-        await websocket.send(json.dumps({
+        await websocket.send(orjson.dumps({
             "type": "error",
             "data": error_data
-        }))
+        }), text=True)
     except Exception as e:
         logger.error(f"Failed to send error message: {e}")
 
@@ -105,8 +132,8 @@ async def handle_messages(websocket: Any, session: SessionState, session_id: str
 
         # Check for exceptions
         for task in done:
-            if task.exception():
-                exc = task.exception()
+            exc = task.exception()
+            if exc:
                 exc_str = str(exc).lower()
 
                 # Handle quota/rate limit errors
@@ -127,14 +154,12 @@ async def handle_messages(websocket: Any, session: SessionState, session_id: str
                     raise exc
 
     finally:
-        # Cancel pending tasks
-        for task in [client_task, gemini_task]:
-            if task and not task.done():
-                task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
+        # Cancel whichever side is still running and wait for it to unwind
+        pending_tasks = [t for t in (client_task, gemini_task) if t and not t.done()]
+        for task in pending_tasks:
+            task.cancel()
+        if pending_tasks:
+            await asyncio.gather(*pending_tasks, return_exceptions=True)
 
 
 async def handle_client_messages(websocket: Any, session: SessionState, session_id: str) -> None:
@@ -143,16 +168,20 @@ async def handle_client_messages(websocket: Any, session: SessionState, session_
     Uses send_realtime_input() for audio and send_client_content() for text.
     """
     try:
+        # Hold client input until the backstory turn is ahead of it on the wire,
+        # otherwise the user's reply would be consumed as the acknowledgment
+        await session.backstory_sent.wait()
+
         async for message in websocket:
             try:
-                await update_session_activity(session_id)
+                touch_session(session_id, session)
                 session.message_count += 1
 
-                data = json.loads(message)
+                data = orjson.loads(message)
 
                 # Validate message structure
-                is_valid, error_msg = validate_message_structure(data)
-                if not is_valid:
+                msg_type, error_msg = validate_message_structure(data)
+                if msg_type is None:
                     logger.warning(f"Invalid message: {error_msg}")
                     await send_error_message(websocket, {
                         "message": f"Invalid message: {error_msg}",
@@ -160,16 +189,9 @@ async def handle_client_messages(websocket: Any, session: SessionState, session_
                     })
                     continue
 
-                msg_type = data["type"]
-
-                if msg_type == "audio":
-                    await handle_audio_input(session, data, websocket)
-                elif msg_type == "image":
-                    await handle_image_input(session, data, websocket)
-                elif msg_type == "text":
-                    await handle_text_input(session, data, websocket)
-                elif msg_type == "tool_response":
-                    await handle_tool_response(session, data, websocket)
+                handler = _MESSAGE_HANDLERS.get(msg_type)
+                if handler:
+                    await handler(session, data, websocket)
                 elif msg_type == "interrupt":
                     # Client detected barge-in locally and wants to stop audio immediately
                     logger.info("🛑 Client interrupt signal received")
@@ -181,8 +203,8 @@ async def handle_client_messages(websocket: Any, session: SessionState, session_
                     logger.warning(f"Unsupported message type: {msg_type}")
 
             except Exception as e:
-                logger.error(f"Error handling client message: {e}")
-                logger.error(traceback.format_exc())
+                # Full traceback only at DEBUG (formatting it walks the whole stack)
+                logger.error(f"Error handling client message: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
 
     except Exception as e:
         if "connection closed" not in str(e).lower():
@@ -199,9 +221,18 @@ async def handle_audio_input(session: SessionState, data: dict, websocket: Any)
         if not audio_b64:
             return
 
-        # Security: Validate size
-        estimated_size = len(audio_b64) * 3 // 4
-        if estimated_size > MAX_AUDIO_SIZE_BYTES:
+        # Decode once on ingress - the SDK takes raw bytes in the Blob
+        try:
+            audio_bytes = pybase64.b64decode(audio_b64, validate=True)
+        except (ValueError, TypeError):
+            await send_error_message(websocket, {
+                "message": "Invalid audio data",
+                "error_type": "invalid_message"
+            })
+            return
+
+        # Security: Validate size (exact decoded length)
+        if len(audio_bytes) > MAX_AUDIO_SIZE_BYTES:
             await send_error_message(websocket, {
                 "message": "Audio data too large",
                 "error_type": "size_limit_exceeded"
@@ -217,7 +248,7 @@ async def handle_audio_input(session: SessionState, data: dict, websocket: Any)
         # Use send() with input dict containing data and mime_type
         await asyncio.wait_for(
             session.genai_session.send(input={
-                "data": audio_b64,
+                "data": audio_bytes,
                 "mime_type": AUDIO_MIME_TYPE_INPUT
             }, end_of_turn=True),
             timeout=SEND_TIMEOUT_SECONDS
@@ -243,22 +274,31 @@ async def handle_image_input(session: SessionState, data: dict, websocket: Any)
         if not image_b64:
             return
 
-        # Security: Validate size
-        estimated_size = len(image_b64) * 3 // 4
-        if estimated_size > MAX_IMAGE_SIZE_BYTES:
+        # Decode once on ingress - the SDK takes raw bytes in the Blob
+        try:
+            image_bytes = pybase64.b64decode(image_b64, validate=True)
+        except (ValueError, TypeError):
+            await send_error_message(websocket, {
+                "message": "Invalid image data",
+                "error_type": "invalid_message"
+            })
+            return
+
+        # Security: Validate size (exact decoded length)
+        if len(image_bytes) > MAX_IMAGE_SIZE_BYTES:
             await send_error_message(websocket, {
                 "message": "Image data too large",
                 "error_type": "size_limit_exceeded"
             })
             return
 
-        logger.info(f"📤 Sending image: {len(image_b64)} bytes base64")
+        logger.info(f"📤 Sending image: {len(image_bytes)} bytes")
 
         # OFFICIAL GOOGLE PATTERN from src/project-livewire/server/core/websocket_handler.py:156-160
         # Use send() with input dict containing data and mime_type
         await asyncio.wait_for(
             session.genai_session.send(input={
-                "data": image_b64,
+                "data": image_bytes,
                 "mime_type": "image/jpeg"
             }),
             timeout=SEND_TIMEOUT_SECONDS
@@ -328,6 +368,15 @@ async def handle_tool_response(session: SessionState, data: dict, websocket: Any
         raise
 
 
+# Dispatch table for data-carrying client messages (interrupt/end are inline)
+_MESSAGE_HANDLERS = {
+    "audio": handle_audio_input,
+    "image": handle_image_input,
+    "text": handle_text_input,
+    "tool_response": handle_tool_response,
+}
+
+
 async def handle_gemini_responses(websocket: Any, session: SessionState) -> None:
     """
     SDK-COMPLIANT: Handle responses from Gemini using session.receive().
@@ -347,66 +396,77 @@ async def handle_gemini_responses(websocket: Any, session: SessionState) -> None
                 try:
                     response_count += 1
 
+                    # One getattr per field (no hasattr + second lookup)
                     # SDK-COMPLIANT: Handle setup_complete
-                    if hasattr(response, 'setup_complete') and response.setup_complete:
+                    if getattr(response, 'setup_complete', None):
                         logger.info("✅ Setup complete acknowledged")
-                        await websocket.send(json.dumps({
-                            "type": "setup_complete"
-                        }))
+                        await websocket.send(_MSG_SETUP_COMPLETE, text=True)
                         continue
 
                     # SDK-COMPLIANT: Handle server_content (audio, text, interruptions)
                     # Fast path: check server_content first (most common)
                     server_content = getattr(response, 'server_content', None)
                     if server_content:
-                        await process_server_content(websocket, session, server_content)
+                        if session.backstory_done.is_set():
+                            await process_server_content(websocket, session, server_content)
+                        # Backstory acknowledgment turn: consume it without forwarding
+                        elif (getattr(server_content, 'turn_complete', None)
+                              or getattr(server_content, 'interrupted', None)):
+                            logger.info("✅ Backstory processing complete")
+                            session.backstory_done.set()
 
                     # SDK-COMPLIANT: Handle tool_call (function calling)
-                    if hasattr(response, 'tool_call') and response.tool_call:
-                        logger.info(f"🔧 Tool call received: {response.tool_call}")
-                        await websocket.send(json.dumps({
+                    tool_call = getattr(response, 'tool_call', None)
+                    if tool_call:
+                        logger.info(f"🔧 Tool call received: {tool_call}")
+                        await websocket.send(orjson.dumps({
                             "type": "tool_call",
                             "data": {
-                                "name": response.tool_call.function_call.name,
-                                "args": response.tool_call.function_call.args
+                                "name": tool_call.function_call.name,
+                                "args": tool_call.function_call.args
                             }
-                        }))
+                        }), text=True)
 
                     # SDK-COMPLIANT: Handle usage_metadata
-                    if hasattr(response, 'usage_metadata') and response.usage_metadata:
-                        logger.info(f"📊 Usage metadata: {response.usage_metadata}")
-                        session.total_tokens = getattr(response.usage_metadata, 'total_token_count', 0)
+                    usage_metadata = getattr(response, 'usage_metadata', None)
+                    if usage_metadata:
+                        logger.info(f"📊 Usage metadata: {usage_metadata}")
+                        session.total_tokens = getattr(usage_metadata, 'total_token_count', 0)
 
                     # SDK-COMPLIANT: Handle go_away (graceful shutdown)
-                    if hasattr(response, 'go_away') and response.go_away:
+                    if getattr(response, 'go_away', None):
                         logger.info("🚪 Server requested disconnect (go_away)")
-                        await websocket.send(json.dumps({
-                            "type": "go_away",
-                            "data": {"message": "Server closing session"}
-                        }))
+                        await websocket.send(_MSG_GO_AWAY, text=True)
                         break
 
                 except Exception as e:
-                    logger.error(f"Error processing Gemini response: {e}")
-                    logger.error(traceback.format_exc())
+                    logger.error(f"Error processing Gemini response: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
 
     finally:
         logger.debug("handle_gemini_responses finished")
 
 
+async def send_audio_frame(websocket: Any, audio_chunks: list) -> None:
+    """Send raw PCM chunks to the client as one base64 audio message."""
+    # Audio data is raw bytes - encode to base64 for client
+    audio = audio_chunks[0] if len(audio_chunks) == 1 else b"".join(audio_chunks)
+    # text=True keeps it a text frame (client JSON.parses it)
+    await websocket.send(
+        _AUDIO_PREFIX + pybase64.b64encode(audio) + _AUDIO_SUFFIX,
+        text=True
+    )
+
+
 async def process_server_content(websocket: Any, session: SessionState, server_content: Any) -> None:
     """
     SDK-COMPLIANT: Process server_content including audio, text, and interruptions.
     """
     try:
         # SDK-COMPLIANT: Check for interruption
-        if hasattr(server_content, 'interrupted') and server_content.interrupted:
+        if getattr(server_content, 'interrupted', None):
             logger.info("⚠️ Interruption detected")
-            await websocket.send(json.dumps({
-                "type": "interrupted",
-                "data": {"message": "Response interrupted"}
-            }))
-            session.is_receiving_response = False
+            await websocket.send(_MSG_INTERRUPTED, text=True)
+            session.response_active.clear()
             session.client_interrupted = False  # Reset flag
             return
 
@@ -418,7 +478,11 @@ async def process_server_content(websocket: Any, session: SessionState, server_c
         # SDK-COMPLIANT: Process model_turn (audio and text parts)
         model_turn = getattr(server_content, 'model_turn', None)
         if model_turn:
-            session.is_receiving_response = True
+            session.response_active.set()
+
+            # Consecutive audio parts are fused into one frame (fewer sends);
+            # pending audio is flushed before any text part to keep ordering
+            audio_chunks = []
 
             for part in model_turn.parts:
                 # Double-check client interrupt before sending each part
@@ -429,28 +493,33 @@ async def process_server_content(websocket: Any, session: SessionState, server_c
                 # SDK-COMPLIANT: Handle inline_data (audio) - fast path
                 inline_data = getattr(part, 'inline_data', None)
                 if inline_data:
-                    # Audio data is raw bytes - encode to base64 for client
-                    audio_base64 = base64.b64encode(inline_data.data).decode('utf-8')
-                    # Use string concatenation instead of json.dumps for simple messages (faster)
-                    await websocket.send(f'{{"type":"audio","data":"{audio_base64}"}}')
+                    audio_chunks.append(inline_data.data)
 
                 # SDK-COMPLIANT: Handle text
                 else:
                     text = getattr(part, 'text', None)
                     if text:
-                        # Use json.dumps for text (handles control characters properly)
-                        await websocket.send(json.dumps({
+                        if audio_chunks:
+                            await send_audio_frame(websocket, audio_chunks)
+                            audio_chunks = []
+
+                        # JSON-encode text (handles control characters properly)
+                        await websocket.send(orjson.dumps({
                             "type": "text",
                             "data": text
-                        }))
+                        }), text=True)
+
+            if audio_chunks:
+                if session.client_interrupted:
+                    logger.info("⏭️ Stopping mid-response (client interrupted)")
+                    return
+                await send_audio_frame(websocket, audio_chunks)
 
         # SDK-COMPLIANT: Handle turn_complete
-        if hasattr(server_content, 'turn_complete') and server_content.turn_complete:
+        if getattr(server_content, 'turn_complete', None):
             logger.info("✅ Turn complete")
-            await websocket.send(json.dumps({
-                "type": "turn_complete"
-            }))
-            session.is_receiving_response = False
+            await websocket.send(_MSG_TURN_COMPLETE, text=True)
+            session.response_active.clear()
             session.client_interrupted = False  # Reset flag
 
     except Exception as e:
@@ -458,32 +527,35 @@ async def process_server_content(websocket: Any, session: SessionState, server_c
             logger.error(f"Error sending server content: {e}")
 
 
-async def wait_for_setup_complete(session: SessionState) -> bool:
+async def preload_backstory(session: SessionState, backstory_text: str) -> None:
     """
-    SDK-COMPLIANT: Wait for setup_complete before sending data.
+    KV CACHE PRELOADING: Send the backstory to load it into the KV cache.
+    Runs detached so the client gets "ready" without waiting on the round-trip.
+    The acknowledgment turn is consumed by handle_gemini_responses (the only
+    receive() consumer), which sets session.backstory_done when it ends.
+    Client input is held until session.backstory_sent is set, so the backstory
+    turn always reaches Gemini ahead of the first user turn.
     """
     try:
-        logger.info("⏳ Waiting for setup_complete...")
-
-        async def check_setup():
-            async for response in session.genai_session.receive():
-                if hasattr(response, 'setup_complete') and response.setup_complete:
-                    logger.info("✅ Setup complete received")
-                    return True
-            return False
-
-        setup_received = await asyncio.wait_for(
-            check_setup(),
-            timeout=SETUP_TIMEOUT_SECONDS
+        logger.info(f"📝 Preloading backstory into KV cache ({len(backstory_text)} chars)")
+        await asyncio.wait_for(
+            session.genai_session.send(input=backstory_text, end_of_turn=True),
+            timeout=SEND_TIMEOUT_SECONDS
         )
-        return setup_received
+        logger.info("✅ Backstory preloaded into KV cache")
 
     except asyncio.TimeoutError:
-        logger.warning("⚠️ Setup complete timeout - proceeding anyway")
-        return False
+        # The frame may already be on the wire - leave backstory_done to the
+        # receive side, which sets it when the acknowledgment turn ends
+        logger.warning("⚠️ Backstory preload send timed out")
+
     except Exception as e:
-        logger.error(f"Error waiting for setup_complete: {e}")
-        return False
+        logger.warning(f"⚠️ Failed to preload backstory: {e}")
+        # Continue anyway - system instructions still have the persona
+        session.backstory_done.set()  # send() failed, so no acknowledgment is coming
+
+    finally:
+        session.backstory_sent.set()
 
 
 async def handle_client(websocket: Any) -> None:
@@ -492,6 +564,7 @@ async def handle_client(websocket: Any) -> None:
     """
     session_id = str(uuid.uuid4())
     session = await create_session(session_id)
+    preload_task: Optional[asyncio.Task] = None
 
     try:
         # SDK-COMPLIANT: Create session context manager
@@ -502,39 +575,25 @@ async def handle_client(websocket: Any) -> None:
         async with gemini_session_context as gemini_session:
             session.genai_session = gemini_session
 
-            # KV CACHE PRELOADING: Send backstory to load it into KV cache
-            backstory_text = get_backstory_for_kv_cache()
-            if backstory_text:
-                try:
-                    logger.info(f"📝 Preloading backstory into KV cache ({len(backstory_text)} chars)")
-                    await asyncio.wait_for(
-                        gemini_session.send(input=backstory_text, end_of_turn=True),
-                        timeout=SEND_TIMEOUT_SECONDS
-                    )
-                    logger.info("✅ Backstory preloaded into KV cache")
-
-                    # Wait for and consume the model's acknowledgment response
-                    # This ensures the backstory is fully processed before user interaction
-                    async for response in gemini_session.receive():
-                        # Check for turn_complete to know backstory is processed
-                        server_content = getattr(response, 'server_content', None)
-                        if server_content and hasattr(server_content, 'turn_complete') and server_content.turn_complete:
-                            logger.info("✅ Backstory processing complete")
-                            break
-                        # Stop after first response cycle
-                        if server_content:
-                            break
-
-                except Exception as e:
-                    logger.warning(f"⚠️ Failed to preload backstory: {e}")
-                    # Continue anyway - system instructions still have the persona
+            # KV CACHE PRELOADING: Overlap the backstory send with the ready notification
+            if _BACKSTORY_TEXT:
+                preload_task = asyncio.create_task(preload_backstory(session, _BACKSTORY_TEXT))
+            else:
+                session.backstory_sent.set()
+                session.backstory_done.set()
 
-            # Send ready to client
-            await websocket.send(json.dumps({"ready": True}))
-            logger.info(f"✅ Session {session_id} ready")
-
-            # Start message handling
-            await handle_messages(websocket, session, session_id)
+            try:
+                # Send ready to client
+                await websocket.send(_MSG_READY, text=True)
+                logger.info(f"✅ Session {session_id} ready")
+
+                # Start message handling
+                await handle_messages(websocket, session, session_id)
+            finally:
+                # Stop a still-pending backstory send before the Gemini session closes
+                if preload_task and not preload_task.done():
+                    preload_task.cancel()
+                    await asyncio.gather(preload_task, return_exceptions=True)
 
     except asyncio.TimeoutError:
         logger.info(f"Session {session_id} timed out")
@@ -547,8 +606,7 @@ async def handle_client(websocket: Any) -> None:
             pass
 
     except Exception as e:
-        logger.error(f"Error in handle_client: {e}")
-        logger.error(traceback.format_exc())
+        logger.error(f"Error in handle_client: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
 
         if "connection closed" not in str(e).lower():
             try:
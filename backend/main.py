@@ -7,15 +7,18 @@ Supports both local development and Cloud Run deployment
 import asyncio
 import logging
 import os
-from collections import defaultdict
-from time import time
+import traceback
+from collections import OrderedDict
+from typing import Optional
 
 import websockets
 from websockets.legacy.server import WebSocketServerProtocol
 
-from core.websocket_handler import handle_client
-from core.session import get_active_session_count
+from config import api_config
+from core.websocket_handler import handle_client, MAX_FRAME_SIZE_BYTES
+from core.session import get_active_session_count, list_sessions, stop_timeout_sweep
 from core.auth import is_cloud_run, is_auth_enabled, get_auth_instance
+from core.health_check import start_health_check_server
 
 # Environment configuration (load before logging)
 DEBUG = os.getenv("DEBUG", "false").lower() == "true"
@@ -47,8 +50,9 @@ def get_default_allowed_origins():
 
 ALLOWED_ORIGINS_STR = os.getenv("ALLOWED_ORIGINS", get_default_allowed_origins())
 ALLOWED_ORIGINS = [origin.strip() for origin in ALLOWED_ORIGINS_STR.split(",") if origin.strip()]
+ALLOWED_ORIGINS_SET = frozenset(ALLOWED_ORIGINS)  # O(1) membership; the list keeps log order
 
-MAX_MESSAGE_SIZE = 1024 * 1024  # 1MB max message size
+MAX_MESSAGE_SIZE = MAX_FRAME_SIZE_BYTES  # Derived from the per-message payload limits
 
 # ALLOW_NO_ORIGIN: Auto-detect based on environment
 # Local: Allow for easier testing
@@ -61,51 +65,78 @@ def get_default_allow_no_origin():
 
 ALLOW_NO_ORIGIN = os.getenv("ALLOW_NO_ORIGIN", get_default_allow_no_origin()).lower() == "true"
 
-# Rate limiting: max 10 connections per IP per minute
-connection_attempts = defaultdict(list)
-MAX_CONNECTIONS_PER_MINUTE = 10
-RATE_LIMIT_WINDOW_SECONDS = 60  # Rate limit window (1 minute)
-RATE_LIMITER_CLEANUP_INTERVAL = 300  # Clean up old entries every 5 minutes
-
-# Connection limiting
+# Rate limiting: max 10 connections per IP per minute (token bucket)
+# ip -> [tokens, last refill time]; tokens refill lazily on each check
+# Kept in LRU order (least recently seen first) so eviction is O(1)
+connection_attempts: "OrderedDict[str, list[float]]" = OrderedDict()
+RATE_LIMITER_MAX_ENTRIES = 10_000  # Bounds memory under IP churn
+MAX_CONNECTIONS_PER_MINUTE = 10  # Bucket capacity (burst size)
+RATE_LIMIT_WINDOW_SECONDS = 60  # Time for an empty bucket to refill completely
+RATE_LIMIT_REFILL_PER_SECOND = MAX_CONNECTIONS_PER_MINUTE / RATE_LIMIT_WINDOW_SECONDS
+HOUSEKEEPING_INTERVAL_SECONDS = 300  # Evict idle IPs every 5 minutes
+
+# Connection limiting: active_connections is only changed under _capacity_cond,
+# so the capacity check and the increment are a single atomic step
 MAX_CONCURRENT_CONNECTIONS = 100
+CONNECTION_ADMISSION_TIMEOUT_SECONDS = 2  # Wait this long for a free slot before rejecting
 active_connections = 0
-connection_semaphore = asyncio.Semaphore(MAX_CONCURRENT_CONNECTIONS)
+_capacity_cond = asyncio.Condition()
 
 
-def check_rate_limit(ip_address: str) -> bool:
-    """Check if IP is within rate limits."""
-    now = time()
+def check_rate_limit(ip_address: str, now: float) -> bool:
+    """
+    Check if IP is within rate limits (O(1): one token bucket per IP).
+    `now` is event loop time (monotonic), captured once per connection.
+    """
+    bucket = connection_attempts.get(ip_address)
+    if bucket is None:
+        if len(connection_attempts) >= RATE_LIMITER_MAX_ENTRIES:
+            connection_attempts.popitem(last=False)  # Least recently seen IP
+        bucket = connection_attempts[ip_address] = [float(MAX_CONNECTIONS_PER_MINUTE), now]
+    else:
+        connection_attempts.move_to_end(ip_address)
+        tokens = bucket[0] + (now - bucket[1]) * RATE_LIMIT_REFILL_PER_SECOND
 
-    # Remove old attempts (older than rate limit window)
-    connection_attempts[ip_address] = [
-        t for t in connection_attempts[ip_address] if now - t < RATE_LIMIT_WINDOW_SECONDS
-    ]
+        # Rejection fast path: no bucket writes (refill keeps accruing from the
+        # last refill time) and no log here - the caller logs the rejection once
+        if tokens < 1:
+            return False
 
-    if len(connection_attempts[ip_address]) >= MAX_CONNECTIONS_PER_MINUTE:
-        logger.warning(f"⚠️ Rate limit exceeded for {ip_address}")
-        return False
+        bucket[0] = min(MAX_CONNECTIONS_PER_MINUTE, tokens)
+        bucket[1] = now
 
-    # Add current attempt to dict (not local list!)
-    connection_attempts[ip_address].append(now)
+    bucket[0] -= 1
     return True
 
 
+def _extract_origin_new(client_websocket) -> Optional[str]:
+    """New asyncio API (websockets.serve in 14.0+)."""
+    return client_websocket.request.headers.get("Origin")
+
+
+def _extract_origin_legacy(client_websocket) -> Optional[str]:
+    """Legacy API (websockets.serve in 13.x and earlier)."""
+    return client_websocket.request_headers.get("Origin")
+
+
+# Resolve the header accessor once for the installed websockets version
+# instead of probing attributes on every connection
+try:
+    from websockets.asyncio.server import serve as _asyncio_serve
+    _USES_NEW_API = websockets.serve is _asyncio_serve
+except ImportError:
+    _USES_NEW_API = False
+
+_extract_origin = _extract_origin_new if _USES_NEW_API else _extract_origin_legacy
+
+
 async def validate_origin(client_websocket: WebSocketServerProtocol) -> bool:
     """
     Validate WebSocket origin header.
     SECURITY: Fails closed - returns False on error or missing origin (unless ALLOW_NO_ORIGIN=true)
     """
     try:
-        # New API (websockets 13.0+)
-        if hasattr(client_websocket, 'request') and hasattr(client_websocket.request, 'headers'):
-            origin = client_websocket.request.headers.get("Origin")
-        # Old API (websockets 12.0 and earlier)
-        elif hasattr(client_websocket, 'request_headers'):
-            origin = client_websocket.request_headers.get("Origin")
-        else:
-            logger.error("❌ Could not access request headers - blocking connection")
-            return False  # SECURITY: Fail closed on error
+        origin = _extract_origin(client_websocket)
     except Exception as e:
         logger.error(f"❌ Error accessing Origin header: {e} - blocking connection")
         return False  # SECURITY: Fail closed on error
@@ -118,73 +149,108 @@ async def validate_origin(client_websocket: WebSocketServerProtocol) -> bool:
             logger.error("❌ No Origin header - blocking connection (set ALLOW_NO_ORIGIN=true to allow)")
             return False  # SECURITY: Fail closed when no origin
 
-    if origin not in ALLOWED_ORIGINS:
+    if origin not in ALLOWED_ORIGINS_SET:
         logger.error(f"❌ Blocked connection from unauthorized origin: {origin}")
         logger.info(f"   Allowed origins: {', '.join(ALLOWED_ORIGINS)}")
         return False
 
-    logger.info(f"✅ Origin validated: {origin}")
+    logger.debug("✅ Origin validated: %s", origin)
     return True
 
 
-async def cleanup_rate_limiter():
-    """Periodically clean up old rate limiter entries to prevent memory leak."""
-    while True:
-        try:
-            await asyncio.sleep(RATE_LIMITER_CLEANUP_INTERVAL)
-            now = time()
-            old_size = len(connection_attempts)
+def cleanup_rate_limiter_once(now: float) -> None:
+    """
+    Evict idle IPs to prevent memory leak.
+    Buckets refill lazily, so this only drops entries that would be full again anyway.
+    """
+    # LRU order: idle IPs (bucket refilled) form a prefix. Count it with one
+    # iterator, stopping at the first IP seen recently, then pop that many
+    # from the front - in place, so the LRU order is kept
+    cleaned = 0
+    for _, last in connection_attempts.values():
+        if now - last < RATE_LIMIT_WINDOW_SECONDS:
+            break
+        cleaned += 1
 
-            # Remove IPs with no recent attempts
-            ips_to_remove = [
-                ip for ip, attempts in connection_attempts.items()
-                if not attempts or all(now - t > RATE_LIMIT_WINDOW_SECONDS for t in attempts)
-            ]
+    for _ in range(cleaned):
+        connection_attempts.popitem(last=False)
 
-            for ip in ips_to_remove:
-                del connection_attempts[ip]
+    if cleaned > 0:
+        logger.info(f"🧹 Cleaned up {cleaned} old IP entries from rate limiter")
 
-            cleaned = old_size - len(connection_attempts)
-            if cleaned > 0:
-                logger.info(f"🧹 Cleaned up {cleaned} old IP entries from rate limiter")
 
+async def housekeeping():
+    """
+    Single periodic task for background cleanups (one timer wakeup per interval).
+    Session timeouts are not polled here - core.session arms its own timer
+    for the next expiry.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(HOUSEKEEPING_INTERVAL_SECONDS)
+        try:
+            cleanup_rate_limiter_once(loop.time())
         except Exception as e:
             logger.error(f"Error in rate limiter cleanup: {e}")
 
 
-async def handle_connection(websocket: WebSocketServerProtocol) -> None:
-    """Handle new WebSocket connection with security checks."""
-    global active_connections
+# Python 3.12+: start background tasks eagerly (run to their first await
+# without an extra event loop iteration). Applied per task, not loop-wide,
+# so connection handling keeps the default scheduling.
+_eager_task_factory = getattr(asyncio, "eager_task_factory", None)
 
-    client_addr = websocket.remote_address
-    client_ip = client_addr[0] if client_addr else "unknown"
 
-    # SECURITY: Check max concurrent connections
-    if not connection_semaphore.locked():
-        async with connection_semaphore:
-            active_connections += 1
+def create_background_task(coro, name: str) -> asyncio.Task:
+    """Create a named background task, eagerly started where supported."""
+    loop = asyncio.get_running_loop()
+    if _eager_task_factory is not None:
+        return _eager_task_factory(loop, coro, name=name)
+    return loop.create_task(coro, name=name)
+
+
+def _has_capacity() -> bool:
+    return active_connections < MAX_CONCURRENT_CONNECTIONS
+
+
+async def acquire_connection_slot() -> bool:
+    """
+    Claim a connection slot, waiting briefly for one to free up.
+    Returns False if the server is still at capacity after the wait.
+    """
+    global active_connections
+
+    async with _capacity_cond:
+        if not _has_capacity():
             try:
-                await _handle_connection_inner(websocket, client_addr, client_ip)
-            finally:
-                active_connections -= 1
-    else:
-        logger.warning(f"❌ Max concurrent connections ({MAX_CONCURRENT_CONNECTIONS}) reached")
-        await websocket.close(code=1008, reason="Server at capacity. Please try again later.")
+                await asyncio.wait_for(
+                    _capacity_cond.wait_for(_has_capacity),
+                    timeout=CONNECTION_ADMISSION_TIMEOUT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                return False
 
+        active_connections += 1
+        return True
 
-async def _handle_connection_inner(websocket: WebSocketServerProtocol, client_addr, client_ip: str) -> None:
-    """Inner connection handler with security checks."""
-    logger.info("=" * 80)
-    logger.info(f"🔌 New WebSocket connection from {client_addr}")
-    logger.info(f"   Active connections: {active_connections}/{MAX_CONCURRENT_CONNECTIONS}")
-    logger.info(f"   Active sessions: {get_active_session_count()}")
-    logger.info("=" * 80)
 
-    # SECURITY: Check rate limiting
-    if not check_rate_limit(client_ip):
-        logger.warning(f"❌ Rate limit exceeded for {client_ip}")
-        await websocket.close(code=1008, reason="Rate limit exceeded. Please try again later.")
-        return
+async def release_connection_slot() -> None:
+    """Return a connection slot and wake one waiting connection."""
+    global active_connections
+
+    async with _capacity_cond:
+        active_connections -= 1
+        _capacity_cond.notify(1)
+
+
+async def handle_connection(websocket: WebSocketServerProtocol) -> None:
+    """
+    Handle new WebSocket connection with security checks.
+    Checks run cheapest-first and before any state changes: an unauthorized
+    origin never consumes a rate-limit token or a connection slot.
+    """
+    now = asyncio.get_running_loop().time()
+    client_addr = websocket.remote_address
+    client_ip = client_addr[0] if client_addr else "unknown"
 
     # SECURITY: Validate origin
     if not await validate_origin(websocket):
@@ -192,19 +258,43 @@ async def _handle_connection_inner(websocket: WebSocketServerProtocol, client_ad
         await websocket.close(code=1008, reason="Unauthorized origin")
         return
 
+    # SECURITY: Check rate limiting
+    if not check_rate_limit(client_ip, now):
+        logger.warning(f"❌ Rate limit exceeded for {client_ip}")
+        await websocket.close(code=1008, reason="Rate limit exceeded. Please try again later.")
+        return
+
+    # SECURITY: Check max concurrent connections
+    if not await acquire_connection_slot():
+        logger.warning(f"❌ Max concurrent connections ({MAX_CONCURRENT_CONNECTIONS}) reached")
+        await websocket.close(code=1008, reason="Server at capacity. Please try again later.")
+        return
+
+    try:
+        await _handle_connection_inner(websocket, client_addr)
+    finally:
+        await release_connection_slot()
+
+
+async def _handle_connection_inner(websocket: WebSocketServerProtocol, client_addr) -> None:
+    """Inner connection handler for an admitted connection."""
+    # One lazily formatted record per open/close (no banner lines on the hot path)
+    logger.info(
+        "🔌 Connection opened from %s (connections %d/%d, sessions %d)",
+        client_addr, active_connections, MAX_CONCURRENT_CONNECTIONS, get_active_session_count()
+    )
+
     try:
         # Handle the client connection
         await handle_client(websocket)
-    except Exception as e:
-        logger.error(f"Error handling connection: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        # Traceback goes through the logging pipeline (handlers, level filtering)
+        logger.exception("Error handling connection")
     finally:
-        logger.info("=" * 80)
-        logger.info(f"🔚 Connection closed for {client_addr}")
-        logger.info(f"   Active connections: {active_connections}/{MAX_CONCURRENT_CONNECTIONS}")
-        logger.info(f"   Active sessions: {get_active_session_count()}")
-        logger.info("=" * 80)
+        logger.info(
+            "🔚 Connection closed for %s (connections %d/%d, sessions %d)",
+            client_addr, active_connections, MAX_CONCURRENT_CONNECTIONS, get_active_session_count()
+        )
 
 
 async def main() -> None:
@@ -246,8 +336,7 @@ async def main() -> None:
 
     logger.info("=" * 80)
 
-    # Import config to initialize (once at startup)
-    from config import api_config
+    # Initialize config (once at startup)
     await api_config.initialize()
 
     logger.info("✅ API Configuration loaded")
@@ -255,15 +344,11 @@ async def main() -> None:
     logger.info("=" * 80)
 
     # Start background tasks
-    cleanup_task = asyncio.create_task(cleanup_rate_limiter())
-
-    from core.session import cleanup_timed_out_sessions
-    session_timeout_task = asyncio.create_task(cleanup_timed_out_sessions())
+    cleanup_task = create_background_task(housekeeping(), name="housekeeping")
 
     # Start health check server
-    from core.health_check import start_health_check_server
     HEALTH_CHECK_PORT = int(os.getenv("HEALTH_CHECK_PORT", "8081"))
-    health_runner = await start_health_check_server(HEALTH_CHECK_PORT)
+    health_server = await start_health_check_server(HEALTH_CHECK_PORT)
 
     async with websockets.serve(
         handle_connection,
@@ -288,27 +373,24 @@ async def main() -> None:
 
             # Cancel background tasks
             cleanup_task.cancel()
-            session_timeout_task.cancel()
 
             try:
                 await cleanup_task
             except asyncio.CancelledError:
                 pass
 
-            try:
-                await session_timeout_task
-            except asyncio.CancelledError:
-                pass
+            # Session timeouts are timer-driven (armed by create_session)
+            stop_timeout_sweep()
 
             # Stop health check server
             try:
-                await health_runner.cleanup()
+                health_server.close()
+                await health_server.wait_closed()
                 logger.info("Health check server stopped")
             except Exception as e:
                 logger.error(f"Error stopping health check server: {e}")
 
             # Clean up all sessions
-            from core.session import list_sessions
             sessions = await list_sessions()
             logger.info(f"Cleaning up {len(sessions)} active sessions...")
 
@@ -326,6 +408,5 @@ if __name__ == "__main__":
         logger.info("\n🛑 Server shutdown requested (KeyboardInterrupt)")
     except Exception as e:
         logger.error(f"❌ Fatal error: {e}")
-        import traceback
         traceback.print_exc()
         raise
@@ -0,0 +1,56 @@
+"""
+Build-time generator for system instructions
+Writes config/_system_instructions_generated.py so cold starts skip
+backstory/config.json parsing and prompt formatting
+
+Usage (from backend/):
+    python tools/gen_prompts.py
+"""
+
+import sys
+import types
+import logging
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+CONFIG_DIR = BACKEND_DIR / 'config'
+OUTPUT_PATH = CONFIG_DIR / '_system_instructions_generated.py'
+
+logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def _import_prompts():
+    """
+    Import config.prompts without running config/__init__.py.
+    The package init builds ApiConfig, which needs an API key that is not
+    available at image build time.
+    """
+    sys.path.insert(0, str(BACKEND_DIR))
+    package = types.ModuleType('config')
+    package.__path__ = [str(CONFIG_DIR)]
+    sys.modules['config'] = package
+
+    from config import prompts
+    return prompts
+
+
+def main() -> None:
+    # Remove any stale output so prompts.py builds the instructions from source
+    OUTPUT_PATH.unlink(missing_ok=True)
+    prompts = _import_prompts()
+    instructions = prompts.SYSTEM_INSTRUCTIONS
+
+    OUTPUT_PATH.write_text(
+        '"""\n'
+        'GENERATED by tools/gen_prompts.py - do not edit\n'
+        'Rebuild the image (or rerun the generator) after changing the backstory or config.json\n'
+        '"""\n\n'
+        f'SYSTEM_INSTRUCTIONS = {instructions!r}\n',
+        encoding='utf-8'
+    )
+    logger.info(f"✅ Wrote {OUTPUT_PATH.name} ({len(instructions)} chars)")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,18 +9,65 @@ No external storage, no complex layers - just pure performance.
 """
 
 import asyncio
-import base64
+import binascii
 import json
 import logging
 import os
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, astuple
 from typing import Optional, AsyncIterator
 
 import google.auth
 import google.auth.transport.requests
 import websockets
 
+# orjson parses/encodes in C and emits bytes (optional - falls back to stdlib json)
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+# pybase64 uses SIMD (AVX2/SSSE3) codecs (optional - falls back to stdlib base64)
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+# Audio input envelope. The Live API takes PCM as base64 inside JSON (no binary
+# frames), and base64 never needs JSON escaping, so the message is
+# prefix + base64 bytes + suffix - no dict build, no str decode, no JSON encode
+_AUDIO_PREFIX = (
+    b'{"clientContent":{"turns":[{"role":"user","parts":[{"inlineData":'
+    b'{"mimeType":"audio/pcm;rate=16000","data":"'
+)
+_AUDIO_SUFFIX = b'"}}]}],"turnComplete":true}}'
+
+# Decoded responses buffered between the reader task and the consumer.
+# Bounded so a slow consumer applies backpressure instead of growing memory
+RESPONSE_QUEUE_MAXSIZE = 64
+
+# Reader -> consumer control items
+_TURN_COMPLETE = {'turn_complete': True}
+_CONNECTION_CLOSED = {'closed': True}
+
+# Idle connected sessions, keyed by everything that goes into the setup message.
+# Reusing one skips the TLS handshake and the 6KB setup send
+SESSION_POOL_MAX_IDLE = 4  # Per key; extra released sessions are closed
+POOL_PING_TIMEOUT_SECONDS = 2  # Liveness check before handing out a pooled session
+_session_pool: dict[tuple, asyncio.Queue] = {}
+
+# Application Default Credentials shared by all sessions: loaded on first use,
+# refreshed only once the token is no longer valid (~hourly)
+_CLOUD_PLATFORM_SCOPES = ['https://www.googleapis.com/auth/cloud-platform']
+_credentials = None
+_auth_request = None
+_credentials_lock = asyncio.Lock()
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -109,52 +156,89 @@ class FastAvatarSession:
         self.model = model
         self.ws = None
         self.session_active = False
+        self._reader: Optional[asyncio.Task] = None
+        self._responses: asyncio.Queue = asyncio.Queue(maxsize=RESPONSE_QUEUE_MAXSIZE)
+        self._pool_key_value: Optional[tuple] = None  # Set when created via acquire()
+        self._turn_in_flight = False  # A turn was sent and its end marker not yet consumed
         
         # Pre-compute system instruction (this is our 6KB payload)
         self.system_instruction = config.to_system_instruction()
         logger.info(f"System instruction size: {len(self.system_instruction)} bytes")
         
-    async def _get_access_token(self) -> str:
-        """Get Google Cloud access token using Application Default Credentials"""
-        credentials, project = google.auth.default(
-            scopes=['https://www.googleapis.com/auth/cloud-platform']
-        )
+        # The setup message is fixed per session config, so encode it once
+        # here instead of on every connect()
+        self._setup_bytes = _dumps(self._build_setup_message())
         
-        auth_req = google.auth.transport.requests.Request()
-        credentials.refresh(auth_req)
-        
-        return credentials.token
+    @staticmethod
+    def _pool_key(config: AvatarConfig, project_id: Optional[str], location: str, model: str) -> tuple:
+        """Everything that shapes the URL or setup message (AvatarConfig itself is unhashable)"""
+        return (project_id or os.getenv("GOOGLE_CLOUD_PROJECT"), location, model, astuple(config))
     
-    async def connect(self):
+    @classmethod
+    async def acquire(
+        cls,
+        config: AvatarConfig,
+        project_id: str = None,
+        location: str = "us-central1",
+        model: str = "gemini-2.0-flash-exp"
+    ) -> "FastAvatarSession":
         """
-        Establish WebSocket connection to Gemini Live API.
-        This is called once per session.
+        Check out a connected session from the pool, or connect a new one.
+        Pooled sessions are ping-checked first; dead ones are closed and skipped.
         """
-        # Get access token
-        access_token = await self._get_access_token()
+        key = cls._pool_key(config, project_id, location, model)
+        idle = _session_pool.get(key)
         
-        # Build WebSocket URL for Live API
-        ws_url = (
-            f"wss://{self.location}-aiplatform.googleapis.com/ws/"
-            f"google.cloud.aiplatform.v1beta1.LlmBidiService/BidiGenerateContent"
-        )
+        while idle is not None and not idle.empty():
+            session = idle.get_nowait()
+            if await session._is_alive():
+                logger.info(f"Reusing pooled session for {config.name} avatar")
+                session._turn_in_flight = False
+                return session
+            await session.close()
         
-        logger.info("Connecting to Gemini Live API...")
+        session = cls(config, project_id=project_id, location=location, model=model)
+        session._pool_key_value = key
+        await session.connect()
+        return session
+    
+    async def release(self):
+        """
+        Return this session to the pool for reuse.
+        Closes it instead if it is dead, the pool is full, or the caller stopped
+        reading mid-turn - leftover responses must never reach the next caller.
+        """
+        if (
+            not self.session_active
+            or self._pool_key_value is None
+            or self._turn_in_flight
+            or not self._responses.empty()
+        ):
+            await self.close()
+            return
         
-        # Connect with auth headers
-        self.ws = await websockets.connect(
-            ws_url,
-            additional_headers={
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {access_token}",
-            },
-            max_size=10**7,  # 10MB max message
-            ping_interval=30,
-            ping_timeout=10,
+        idle = _session_pool.setdefault(
+            self._pool_key_value, asyncio.Queue(maxsize=SESSION_POOL_MAX_IDLE)
         )
-        
-        # Send setup message with our 6KB system instruction
-        setup_message = {
+        try:
+            idle.put_nowait(self)
+        except asyncio.QueueFull:
+            await self.close()
+    
+    async def _is_alive(self) -> bool:
+        """Keepalive check: the connection is open and answers a ping"""
+        if not self.session_active or self.ws is None:
+            return False
+        try:
+            pong_waiter = await self.ws.ping()
+            await asyncio.wait_for(pong_waiter, timeout=POOL_PING_TIMEOUT_SECONDS)
+            return True
+        except Exception:
+            return False
+    
+    def _build_setup_message(self) -> dict:
+        """Build the Live API setup message carrying the system instruction"""
+        return {
             "setup": {
                 "model": f"projects/{self.project_id}/locations/{self.location}/publishers/google/models/{self.model}",
                 
@@ -181,9 +265,65 @@ class FastAvatarSession:
                 # "tools": [...]
             }
         }
+    
+    async def _get_access_token(self) -> str:
+        """Get Google Cloud access token using shared Application Default Credentials"""
+        global _credentials, _auth_request
+        
+        # Lock so concurrent connects trigger one load/refresh, not one each
+        async with _credentials_lock:
+            if _credentials is None:
+                # Blocking file/metadata I/O - keep it off the event loop
+                _credentials, _ = await asyncio.to_thread(
+                    google.auth.default, scopes=_CLOUD_PLATFORM_SCOPES
+                )
+                _auth_request = google.auth.transport.requests.Request()
+            
+            if not _credentials.valid:
+                await asyncio.to_thread(_credentials.refresh, _auth_request)
+            
+            return _credentials.token
+    
+    async def connect(self):
+        """
+        Establish WebSocket connection to Gemini Live API.
+        This is called once per session.
+        """
+        # Get access token
+        access_token = await self._get_access_token()
+        
+        # Build WebSocket URL for Live API
+        ws_url = (
+            f"wss://{self.location}-aiplatform.googleapis.com/ws/"
+            f"google.cloud.aiplatform.v1beta1.LlmBidiService/BidiGenerateContent"
+        )
         
-        await self.ws.send(json.dumps(setup_message))
+        logger.info("Connecting to Gemini Live API...")
+        
+        # Connect with auth headers
+        self.ws = await websockets.connect(
+            ws_url,
+            additional_headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {access_token}",
+            },
+            max_size=10**7,  # 10MB max message
+            ping_interval=30,
+            ping_timeout=10,
+        )
+        
+        # Send setup message with our 6KB system instruction (pre-encoded)
+        # text=True keeps the encoded bytes a text frame (no decode round-trip)
+        await self.ws.send(self._setup_bytes, text=True)
         self.session_active = True
+
+        # Read + decode in the background so the next frame is being
+        # received while the consumer handles the current chunk. Fresh queue
+        # per connection: a previous reader's leftovers (including its
+        # closed marker) must not leak into this connection's turns
+        self._responses = asyncio.Queue(maxsize=RESPONSE_QUEUE_MAXSIZE)
+        self._turn_in_flight = False
+        self._reader = asyncio.create_task(self._read_loop())
         
         logger.info(f"Session established with {self.config.name} avatar")
         logger.info("After 2-3 messages, implicit caching will activate (90% cost reduction)")
@@ -201,26 +341,12 @@ class FastAvatarSession:
         if not self.session_active:
             raise RuntimeError("Session not active. Call connect() first.")
         
-        # Encode audio to base64
-        audio_base64 = base64.b64encode(audio_data).decode('utf-8')
-        
-        # Send audio message
-        message = {
-            "clientContent": {
-                "turns": [{
-                    "role": "user",
-                    "parts": [{
-                        "inlineData": {
-                            "mimeType": "audio/pcm;rate=16000",
-                            "data": audio_base64
-                        }
-                    }]
-                }],
-                "turnComplete": True
-            }
-        }
-        
-        await self.ws.send(json.dumps(message))
+        # Send audio message (base64 bytes spliced into the prebuilt envelope)
+        self._turn_in_flight = True
+        await self.ws.send(
+            _AUDIO_PREFIX + base64.b64encode(audio_data) + _AUDIO_SUFFIX,
+            text=True
+        )
         
         # Stream response audio
         async for response in self._receive_streaming():
@@ -251,55 +377,107 @@ class FastAvatarSession:
             }
         }
         
-        await self.ws.send(json.dumps(message))
+        self._turn_in_flight = True
+        await self.ws.send(_dumps(message), text=True)
         
         # Stream response audio
         async for response in self._receive_streaming():
             if response.get('audio_data'):
                 yield response['audio_data']
     
-    async def _receive_streaming(self) -> AsyncIterator[dict]:
-        """Receive and parse streaming responses"""
-        while True:
-            try:
+    async def _read_loop(self):
+        """Receive and decode frames into the response queue (reader task)"""
+        try:
+            while True:
                 message = await self.ws.recv()
-                data = json.loads(message)
+                try:
+                    data = _loads(message)
+                except ValueError as e:
+                    logger.error(f"Error decoding response: {e}")
+                    continue
                 
-                if data.get('serverContent'):
-                    content = data['serverContent']
-                    
-                    # Extract audio from response
-                    if content.get('modelTurn') and content['modelTurn'].get('parts'):
-                        for part in content['modelTurn']['parts']:
-                            if part.get('inlineData') and part['inlineData'].get('data'):
-                                audio_base64 = part['inlineData']['data']
-                                audio_bytes = base64.b64decode(audio_base64)
-                                yield {'audio_data': audio_bytes}
-                            
-                            # Also capture text if present
-                            if part.get('text'):
-                                yield {'text': part['text']}
+                if not isinstance(data, dict):
+                    logger.error(f"Unexpected non-object response: {type(data).__name__}")
+                    continue
                 
-                # Check if turn is complete
-                if data.get('serverContent', {}).get('turnComplete'):
-                    break
+                # Each key is looked up once and reused (no default-dict allocation)
+                content = data.get('serverContent')
+                if content is not None:
+                    # Extract audio from response
+                    model_turn = content.get('modelTurn')
+                    if model_turn:
+                        try:
+                            await self._put_parts(model_turn)
+                        except (ValueError, TypeError, binascii.Error) as e:
+                            # Bad part: drop it, but still honor turnComplete below
+                            logger.error(f"Error decoding response: {e}")
                     
-            except websockets.exceptions.ConnectionClosed:
-                logger.warning("WebSocket connection closed")
-                self.session_active = False
-                break
-            except Exception as e:
-                logger.error(f"Error receiving response: {e}")
+                    # Check if turn is complete
+                    if content.get('turnComplete'):
+                        await self._responses.put(_TURN_COMPLETE)
+                    
+        except websockets.exceptions.ConnectionClosed:
+            logger.warning("WebSocket connection closed")
+        except Exception as e:
+            logger.error(f"Error receiving response: {e}")
+        finally:
+            # However the reader ends (closed, failed or cancelled), wake the
+            # consumer. If the queue is full, _receive_streaming sees
+            # session_active is False once it has drained it
+            self.session_active = False
+            try:
+                self._responses.put_nowait(_CONNECTION_CLOSED)
+            except asyncio.QueueFull:
+                pass
+    
+    async def _put_parts(self, model_turn: dict):
+        """Decode a modelTurn's parts onto the response queue"""
+        for part in model_turn.get('parts', ()):
+            inline_data = part.get('inlineData')
+            if inline_data:
+                audio_base64 = inline_data.get('data')
+                if audio_base64:
+                    audio_bytes = base64.b64decode(audio_base64)
+                    await self._responses.put({'audio_data': audio_bytes})
+            
+            # Also capture text if present
+            text = part.get('text')
+            if text:
+                await self._responses.put({'text': text})
+    
+    async def _receive_streaming(self) -> AsyncIterator[dict]:
+        """Yield decoded responses for the current turn"""
+        while True:
+            if not self.session_active and self._responses.empty():
+                break  # Reader is gone and nothing is left to read
+            item = await self._responses.get()
+            if item is _TURN_COMPLETE or item is _CONNECTION_CLOSED:
+                self._turn_in_flight = False
                 break
+            yield item
     
     async def close(self):
         """Close the WebSocket connection"""
+        if self._reader:
+            # Wait for the reader's finally to run now, so it can't touch
+            # session state or a new queue after a reconnect
+            self._reader.cancel()
+            await asyncio.gather(self._reader, return_exceptions=True)
+            self._reader = None
         if self.ws:
             await self.ws.close()
             self.session_active = False
             logger.info("Session closed")
 
 
+async def close_session_pool():
+    """Close every idle pooled session (call on shutdown)"""
+    for idle in _session_pool.values():
+        while not idle.empty():
+            await idle.get_nowait().close()
+    _session_pool.clear()
+
+
 # ============================================================================
 # USAGE EXAMPLE
 # ============================================================================
@@ -416,6 +594,7 @@ if __name__ == "__main__":
     
     2. Install dependencies:
        $ pip install websockets google-auth
+       $ pip install orjson pybase64  # Optional: faster JSON and base64
     
     3. Run this script:
        $ python gemini_avatar_fast_kv.py